@@ -1,18 +1,64 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, simpledialog
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+from PIL import Image, ImageTk, ImageDraw, ImageFont, __version__ as PIL_VERSION
 import sqlite3
 import os
 import random
 import shutil
+import functools
+import itertools
+import time
 import json # For saving outfit components as JSON string in DB
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Configuration ---
 WARDROBE_PHOTOS_DIR = "wardrobe_photos"
+THUMBNAILS_DIR = os.path.join(WARDROBE_PHOTOS_DIR, "thumbnails")
+THUMBNAIL_SIZE = (400, 400) # Pre-generated once per item; large enough for every display slot
 DATABASE_NAME = "wardrobe.db"
+CLOTHING_CATEGORIES = ["Top", "Bottom", "Dress", "Outerwear", "Accessory", "Shoes"]
+SQLITE_MAX_VARIABLE_NUMBER = 999 # Conservative default bound-parameter limit for SQLite builds
+ACCESSORY_POOL_SIZE = 8 # Accessory display slots created up front; more are added if ever needed
 
-# Ensure the main photos directory exists
+# Ensure the main photos and thumbnails directories exist
 os.makedirs(WARDROBE_PHOTOS_DIR, exist_ok=True)
+os.makedirs(THUMBNAILS_DIR, exist_ok=True)
+
+# shutil.copy uses the OS zero-copy path (sendfile/fcopyfile/CopyFileW) where it can;
+# a bigger buffer speeds up the read/write fallback, e.g. on network shares
+shutil.COPY_BUFSIZE = max(shutil.COPY_BUFSIZE, 1024 * 1024)
+
+# --- Image Helpers ---
+def create_thumbnail(source_image_path, thumb_path, size=THUMBNAIL_SIZE):
+    """
+    Saves a downscaled PNG copy of an image, so displays decode a small file
+    instead of the full-resolution photo every time.
+    """
+    img = Image.open(source_image_path)
+    img.draft('RGB', size)
+    img.thumbnail(size, Image.LANCZOS)
+    if img.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'): # e.g. CMYK JPEGs can't be written as PNG
+        img = img.convert('RGB')
+    img.save(thumb_path, 'PNG')
+
+_FONT_CACHE = {} # Pixel size -> loaded font; parsing the TTF file is the slow part of drawing placeholder text
+
+def _get_font(px):
+    """Returns the placeholder font at a pixel size, loading it from disk only the first time."""
+    font = _FONT_CACHE.get(px)
+    if font is None:
+        try:
+            font = ImageFont.truetype("arial.ttf", px)
+        except IOError:
+            font = ImageFont.load_default()
+        _FONT_CACHE[px] = font
+    return font
+
+# --- SQL Statements ---
+# Module constants so repeated calls pass the identical string and hit sqlite3's parsed-statement cache
+_SQL_INSERT_ITEM = "INSERT INTO clothing_items (category, color, pattern, formality, image_path) VALUES (?, ?, ?, ?, ?)"
+_SQL_INSERT_ITEM_EXTRA_ROW = ", (?, ?, ?, ?, ?)" # Appended to _SQL_INSERT_ITEM for multi-row inserts
+_SQL_SELECT_ITEMS = "SELECT id, category, color, pattern, formality, image_path FROM clothing_items"
 
 # --- Database Management Class ---
 class WardrobeDatabase:
@@ -22,7 +68,16 @@ class WardrobeDatabase:
         and saved_outfits table if they don't already exist.
         """
         self.conn = sqlite3.connect(db_name)
+        # WAL + NORMAL sync: commits no longer fsync the main database file,
+        # which is safe for this single-writer desktop app
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self.conn.execute('PRAGMA cache_size=-20000') # ~20 MB page cache
         self.cursor = self.conn.cursor()
+        # Suffix source for unique image filenames. Seeded with the current time in ms so
+        # names from a new session never repeat those of an earlier one.
+        self._filename_counter = itertools.count(int(time.time() * 1000))
         self.create_tables()
 
     def create_tables(self):
@@ -49,6 +104,8 @@ class WardrobeDatabase:
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        # Outfit generation filters by category and formality together
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_items_cat_form ON clothing_items(category, formality)')
         self.conn.commit()
 
     def add_item(self, category, color, pattern, formality, source_image_path):
@@ -63,57 +120,134 @@ class WardrobeDatabase:
         Returns:
             int: The ID of the newly added item, or None if an error occurred.
         """
-        # Create category subdirectory if it doesn't exist
-        category_dir = os.path.join(WARDROBE_PHOTOS_DIR, category.replace(" ", "_").lower())
-        os.makedirs(category_dir, exist_ok=True)
-
-        # Generate a unique filename for the copied image
-        filename = os.path.basename(source_image_path)
-        name, ext = os.path.splitext(filename)
-        unique_filename = f"{name}_{os.urandom(4).hex()}{ext}" # Add random hex to ensure uniqueness
-        
-        destination_path = os.path.join(category_dir, unique_filename)
+        return self.bulk_add_items([(category, color, pattern, formality, source_image_path)])
 
+    def bulk_add_items(self, items):
+        """
+        Copies the images of many new clothing items to local storage, then inserts all of
+        them with add_items in a single transaction.
+        Args:
+            items (iterable): Tuples of (category, color, pattern, formality, source_image_path).
+        Returns:
+            int: The ID of the last item added, or None if an error occurred (nothing is added then).
+        """
+        rows = []
+        copied_paths = []
         try:
-            shutil.copy(source_image_path, destination_path)
-            # Store the relative path in the database
-            relative_image_path = os.path.relpath(destination_path, start=os.getcwd())
-            
-            self.cursor.execute('''
-                INSERT INTO clothing_items (category, color, pattern, formality, image_path)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (category, color.lower(), pattern, formality.lower(), relative_image_path))
-            self.conn.commit()
-            return self.cursor.lastrowid
-        except sqlite3.IntegrityError:
-            print(f"Error: Item with image path {source_image_path} already exists. Skipping.")
-            return None
+            for category, color, pattern, formality, source_image_path in items:
+                # Create category subdirectory if it doesn't exist
+                category_dir = os.path.join(WARDROBE_PHOTOS_DIR, category.replace(" ", "_").lower())
+                os.makedirs(category_dir, exist_ok=True)
+
+                # Generate a unique filename for the copied image
+                filename = os.path.basename(source_image_path)
+                name, ext = os.path.splitext(filename)
+                unique_filename = f"{name}_{next(self._filename_counter):08x}{ext}" # Add counter hex to ensure uniqueness
+
+                destination_path = os.path.join(category_dir, unique_filename)
+                copied_paths.append(destination_path)
+                shutil.copy(source_image_path, destination_path)
+                try:
+                    create_thumbnail(destination_path, self._thumbnail_path(destination_path))
+                except Exception as e:
+                    # Not fatal: items without a thumbnail are displayed from the original image
+                    print(f"Warning: Could not create thumbnail for {destination_path}: {e}")
+                # destination_path is already relative to the working directory (WARDROBE_PHOTOS_DIR is);
+                # store it with forward slashes so the database is portable between platforms
+                rows.append((category, color, pattern, formality, destination_path.replace(os.sep, "/")))
+
+            return self.add_items(rows)
+        except sqlite3.IntegrityError as e:
+            print(f"Error: Item already exists ({e}). Skipping.")
         except Exception as e:
             print(f"Error adding item or copying image: {e}")
-            # Clean up copied file if database insertion fails
-            if os.path.exists(destination_path):
-                os.remove(destination_path)
+
+        # Clean up copied files and their thumbnails if copying or database insertion fails
+        for destination_path in copied_paths:
+            for path in (destination_path, self._thumbnail_path(destination_path)):
+                if os.path.exists(path):
+                    os.remove(path)
+        return None
+
+    def add_items(self, rows):
+        """
+        Inserts many clothing item rows in a single transaction, so bulk imports pay for
+        one commit instead of one per row.
+        Args:
+            rows (iterable): Tuples of (category, color, pattern, formality, image_path),
+                             where image_path is already inside the wardrobe photos directory.
+        Returns:
+            int: The ID of the last inserted item, or None if rows was empty.
+        """
+        rows = [(category, color.lower(), pattern, formality.lower(), image_path)
+                for category, color, pattern, formality, image_path in rows]
+        if not rows:
             return None
 
+        # Multi-row VALUES lists, sized so each statement stays under SQLite's bound-parameter limit
+        rows_per_statement = SQLITE_MAX_VARIABLE_NUMBER // 5
+        with self.conn:
+            self.conn.execute("BEGIN")
+            for start in range(0, len(rows), rows_per_statement):
+                chunk = rows[start:start + rows_per_statement]
+                cursor = self.conn.execute(_SQL_INSERT_ITEM + _SQL_INSERT_ITEM_EXTRA_ROW * (len(chunk) - 1),
+                                           [value for row in chunk for value in row])
+        return cursor.lastrowid
+
     def get_all_items(self):
         """
         Retrieves all clothing items from the database.
         Returns:
             list: A list of dictionaries, where each dictionary represents an item.
         """
-        self.cursor.execute('SELECT id, category, color, pattern, formality, image_path FROM clothing_items')
-        rows = self.cursor.fetchall()
-        items = []
-        for row in rows:
-            items.append({
-                'id': row[0],
-                'category': row[1],
-                'color': row[2],
-                'pattern': row[3],
-                'formality': row[4],
-                'image_path': row[5] # This is the relative path
-            })
-        return items
+        return [self._row_to_item(row) for row in self.conn.execute(_SQL_SELECT_ITEMS)]
+
+    def get_items_for_formality_range(self, formalities=None):
+        """
+        Retrieves the items with one of the given formalities, already grouped by category,
+        so only the rows an outfit can use cross from SQLite into Python.
+        Args:
+            formalities (tuple): Allowed lowercase formality names (e.g., ('casual', 'smart casual')),
+                                 or None to accept any formality.
+        Returns:
+            dict: Maps each category in CLOTHING_CATEGORIES to a list of item dictionaries.
+        """
+        query = _SQL_SELECT_ITEMS + ' WHERE category IN ({})'.format(", ".join("?" * len(CLOTHING_CATEGORIES)))
+        params = list(CLOTHING_CATEGORIES)
+        if formalities is not None:
+            query += ' AND formality IN ({})'.format(", ".join("?" * len(formalities)))
+            params.extend(formalities)
+
+        categorized_items = {category: [] for category in CLOTHING_CATEGORIES}
+        for row in self.conn.execute(query, params):
+            categorized_items[row[1]].append(self._row_to_item(row))
+        return categorized_items
+
+    @staticmethod
+    def _thumbnail_path(image_path):
+        """Returns where the pre-generated thumbnail of a stored image lives (image filenames are unique)."""
+        return os.path.join(THUMBNAILS_DIR, os.path.splitext(os.path.basename(image_path))[0] + ".png")
+
+    @staticmethod
+    def _row_to_item(row):
+        """
+        Converts a clothing_items row into an item dictionary, including the normalized
+        fields the styling rules compare so they are computed once per read, not per check.
+        """
+        return {
+            'id': row[0],
+            'category': row[1],
+            'color': row[2],
+            'pattern': row[3],
+            'formality': row[4],
+            'image_path': row[5], # This is the relative path
+            'thumb_path': WardrobeDatabase._thumbnail_path(row[5]),
+            'color_l': row[2].lower(),
+            'formality_lvl': OutfitGenerator.formality_levels.get(row[4].lower(), 0),
+            'patterned': row[3].lower() != 'solid',
+            'color_t': row[2].title(), # Display forms, so rendering doesn't re-case strings every time
+            'formality_t': row[4].title(),
+        }
 
     def delete_item(self, item_id):
         """
@@ -123,46 +257,64 @@ class WardrobeDatabase:
         Returns:
             bool: True if deletion was successful, False otherwise.
         """
+        deleted_count = self.delete_items([item_id])
+        if deleted_count == 0:
+            print(f"Item with ID {item_id} not found in database.")
+        return bool(deleted_count)
+
+    def delete_items(self, item_ids):
+        """
+        Deletes several clothing items in a single transaction, then deletes their image files.
+        Args:
+            item_ids (iterable): The IDs of the items to delete.
+        Returns:
+            int: The number of items deleted, or None if a database error occurred.
+        """
+        item_ids = list(item_ids)
+        image_paths = []
         try:
-            # First, get the image path from the item to be deleted
-            self.cursor.execute('SELECT image_path FROM clothing_items WHERE id = ?', (item_id,))
-            image_path_to_delete = self.cursor.fetchone()
-
-            if image_path_to_delete:
-                image_path = image_path_to_delete[0]
-                self.cursor.execute('DELETE FROM clothing_items WHERE id = ?', (item_id,))
-                self.conn.commit()
-                
-                # Delete the physical image file
+            with self.conn:
+                self.conn.execute("BEGIN") # Also covers the SELECTs, which don't start a transaction implicitly
+                for start in range(0, len(item_ids), SQLITE_MAX_VARIABLE_NUMBER):
+                    chunk = item_ids[start:start + SQLITE_MAX_VARIABLE_NUMBER]
+                    placeholders = ", ".join("?" * len(chunk))
+                    # First, get the image paths of the items to be deleted
+                    image_paths.extend(row[0] for row in self.conn.execute(
+                        f'SELECT image_path FROM clothing_items WHERE id IN ({placeholders})', chunk))
+                    self.conn.execute(f'DELETE FROM clothing_items WHERE id IN ({placeholders})', chunk)
+        except sqlite3.Error as e:
+            print(f"Database error during deletion: {e}")
+            return None
+
+        # Delete the physical image files
+        for image_path in image_paths:
+            try:
                 if os.path.exists(image_path):
                     os.remove(image_path)
                     print(f"Deleted image file: {image_path}")
                 else:
                     print(f"Warning: Image file not found at {image_path} during deletion.")
-                return True
-            else:
-                print(f"Item with ID {item_id} not found in database.")
-                return False
-        except sqlite3.Error as e:
-            print(f"Database error during deletion: {e}")
-            return False
-        except Exception as e:
-            print(f"Error deleting image file: {e}")
-            return False
+                thumb_path = self._thumbnail_path(image_path)
+                if os.path.exists(thumb_path):
+                    os.remove(thumb_path)
+            except OSError as e:
+                print(f"Error deleting image file: {e}")
+        return len(image_paths)
 
     def save_outfit(self, outfit_name, outfit_dict):
         """
         Saves a generated outfit to the saved_outfits table.
-        outfit_dict should contain item IDs and categories/types as a simple structure.
+        outfit_dict maps each outfit part to an item ID (or a list of IDs for accessories).
         """
-        # Convert outfit_dict to a JSON string
-        outfit_json = json.dumps(outfit_dict)
+        # Convert outfit_dict to a compact JSON string (no whitespace after separators)
+        outfit_json = json.dumps(outfit_dict, separators=(',', ':'))
         try:
-            self.cursor.execute('''
-                INSERT INTO saved_outfits (name, outfit_json)
-                VALUES (?, ?)
-            ''', (outfit_name, outfit_json))
-            self.conn.commit()
+            # The connection context manager commits on success and rolls back on error
+            with self.conn:
+                self.conn.execute('''
+                    INSERT INTO saved_outfits (name, outfit_json)
+                    VALUES (?, ?)
+                ''', (outfit_name, outfit_json))
             return True
         except sqlite3.IntegrityError:
             messagebox.showerror("Error", f"Outfit name '{outfit_name}' already exists. Please choose a different name.")
@@ -171,25 +323,74 @@ class WardrobeDatabase:
             messagebox.showerror("Error", f"Failed to save outfit: {e}")
             return False
 
+    def get_items_by_ids(self, item_ids):
+        """
+        Retrieves clothing items by ID with batched 'WHERE id IN (...)' queries.
+        Args:
+            item_ids (iterable): IDs of the items to fetch.
+        Returns:
+            dict: Maps each ID that still exists in the wardrobe to its item dictionary.
+        """
+        item_ids = list(item_ids)
+        items_by_id = {}
+        for start in range(0, len(item_ids), SQLITE_MAX_VARIABLE_NUMBER):
+            chunk = item_ids[start:start + SQLITE_MAX_VARIABLE_NUMBER]
+            query = _SQL_SELECT_ITEMS + ' WHERE id IN ({})'.format(", ".join("?" * len(chunk)))
+            for row in self.conn.execute(query, chunk):
+                items_by_id[row[0]] = self._row_to_item(row)
+        return items_by_id
+
     def get_saved_outfits(self):
-        """Retrieves all saved outfits."""
+        """
+        Retrieves all saved outfits. Their items are left as saved IDs ('outfit_refs');
+        use resolve_saved_outfit to look up the items of the one being loaded.
+        """
         self.cursor.execute('SELECT id, name, outfit_json, timestamp FROM saved_outfits ORDER BY timestamp DESC')
-        rows = self.cursor.fetchall()
         saved_outfits = []
-        for row in rows:
+        for row in self.cursor.fetchall():
             saved_outfits.append({
                 'id': row[0],
                 'name': row[1],
-                'outfit_data': json.loads(row[2]), # Parse JSON back to dict
+                'outfit_refs': json.loads(row[2]), # Parse JSON back to dict
                 'timestamp': row[3]
             })
         return saved_outfits
 
+    def resolve_saved_outfit(self, outfit_refs):
+        """
+        Resolves a saved outfit's item IDs to full item dictionaries with a batched
+        primary-key lookup, independent of how large the wardrobe is.
+        """
+        needed_ids = set()
+        for part, ref in outfit_refs.items():
+            refs = ref if part == 'accessories' else [ref]
+            needed_ids.update(self._saved_item_id(r) for r in refs if r is not None)
+        return self._resolve_outfit(outfit_refs, self.get_items_by_ids(needed_ids))
+
+    @staticmethod
+    def _saved_item_id(ref):
+        """Returns the item ID of a saved outfit entry (older saves stored {'id': ..., 'category': ...})."""
+        return ref['id'] if isinstance(ref, dict) else ref
+
+    @classmethod
+    def _resolve_outfit(cls, outfit_refs, items_by_id):
+        """
+        Builds a full outfit dict from saved item IDs. Items that were deleted from
+        the wardrobe since the outfit was saved are left out.
+        """
+        outfit = {'top': None, 'bottom': None, 'dress': None, 'outerwear': None, 'accessories': [], 'shoes': None}
+        for part, ref in outfit_refs.items():
+            if part == 'accessories':
+                outfit[part] = [items_by_id[cls._saved_item_id(r)] for r in ref if cls._saved_item_id(r) in items_by_id]
+            else:
+                outfit[part] = items_by_id.get(cls._saved_item_id(ref))
+        return outfit
+
     def delete_saved_outfit(self, outfit_id):
         """Deletes a saved outfit by its ID."""
         try:
-            self.cursor.execute('DELETE FROM saved_outfits WHERE id = ?', (outfit_id,))
-            self.conn.commit()
+            with self.conn:
+                self.conn.execute('DELETE FROM saved_outfits WHERE id = ?', (outfit_id,))
             return True
         except Exception as e:
             messagebox.showerror("Error", f"Failed to delete saved outfit: {e}")
@@ -199,27 +400,38 @@ class WardrobeDatabase:
         """Closes the database connection."""
         self.conn.close()
 
-# --- Outfit Generation Logic Class ---
+# --- Outfit Generation Logic ---
+@functools.lru_cache(maxsize=None)
+def _colors_clash(color1, color2):
+    """
+    Memoized color clash check. The rule tables are OutfitGenerator class constants and
+    colors come from a small vocabulary, so each (color1, color2) answer is computed once.
+    """
+    if not color1 or not color2:
+        return False
+    if color1 in OutfitGenerator.NEUTRAL_COLORS or color2 in OutfitGenerator.NEUTRAL_COLORS:
+        return False
+    return frozenset((color1, color2)) in OutfitGenerator.CLASH_PAIRS
+
+
 class OutfitGenerator:
-    def __init__(self, clothing_items):
+    def __init__(self, categorized_items):
         """
-        Initializes the OutfitGenerator with the current wardrobe items.
+        Initializes the OutfitGenerator with wardrobe items already grouped by category.
         Args:
-            clothing_items (list): A list of dictionaries, each representing a clothing item.
-        """
-        self.items = clothing_items
-        self.categories = {
-            'Top': [],
-            'Bottom': [],
-            'Dress': [],
-            'Outerwear': [],
-            'Accessory': [],
-            'Shoes': [],
-        }
-        # Populate categories for faster access
-        for item in self.items:
-            if item['category'] in self.categories:
-                self.categories[item['category']].append(item)
+            categorized_items (dict): Maps a category (e.g., 'Top') to a list of item dictionaries,
+                                      as returned by WardrobeDatabase.get_items_for_formality_range.
+        """
+        self.categories = {category: categorized_items.get(category, []) for category in CLOTHING_CATEGORIES}
+
+        # Integer-encode the colors in this wardrobe and precompute which pairs clash,
+        # so outfit search compares small ints instead of lowercasing and scanning rule lists
+        self.color_codes = {}
+        for items in self.categories.values():
+            for item in items:
+                self.color_codes.setdefault(item['color_l'], len(self.color_codes))
+        self.color_clash = [[self._do_colors_clash(color1, color2) for color2 in self.color_codes]
+                            for color1 in self.color_codes]
 
     # Define formality levels (can be expanded)
     formality_levels = {
@@ -254,34 +466,70 @@ class OutfitGenerator:
 
     neutral_colors = ['black', 'white', 'grey', 'beige', 'navy']
 
-    def _get_random_element(self, arr):
-        """Helper to get a random element from a list, returns None if list is empty."""
-        if not arr:
+    # Symmetric lookup tables derived from the rules above: one set membership test per clash check
+    CLASH_PAIRS = frozenset(frozenset((color1, color2)) for color1, clashes in clashing_colors.items() for color2 in clashes)
+    NEUTRAL_COLORS = frozenset(neutral_colors)
+
+    @classmethod
+    def formalities_for_occasion(cls, occasion_formality_level):
+        """
+        Returns the formality names suitable for an occasion level, as a tuple for
+        WardrobeDatabase.get_items_for_formality_range, or None for the 'Any' occasion.
+        Uses the same +/- 1 tolerance as _is_item_suitable_for_occasion.
+        """
+        if occasion_formality_level == 0:
             return None
-        return random.choice(arr)
+        return tuple(name for name, level in cls.formality_levels.items() if abs(level - occasion_formality_level) <= 1)
+
+    def compatible_candidates(self, category, fixed_items):
+        """
+        Batch compatibility filter for swapping one part of an outfit.
+        Args:
+            category (str): Category to take candidates from (e.g., 'Top', 'Accessory').
+            fixed_items (list): The items that stay in the outfit.
+        Returns:
+            list: The items of the category that can join fixed_items without breaking
+                  the color, formality or pattern rules.
+        """
+        # The fixed items are the same for every candidate, so check them against each other once
+        for i, item1 in enumerate(fixed_items):
+            for item2 in fixed_items[i + 1:]:
+                if self._do_colors_clash(item1['color_l'], item2['color_l']) or not self._do_formalities_match(item1, item2):
+                    return []
+        fixed_patterned_count = sum(1 for fixed in fixed_items if fixed['patterned'])
+
+        # Struct-of-arrays view of the candidates, tested through lookup tables (one entry per
+        # color code / formality level) that are built once against all the fixed items
+        candidates = self.categories[category]
+        candidate_colors, candidate_forms = self._encode(candidates)
+        color_ok = [not any(self._do_colors_clash(color, fixed['color_l']) for fixed in fixed_items)
+                    for color in self.color_codes]
+        form_ok = {level: all(abs(level - fixed['formality_lvl']) <= 1 for fixed in fixed_items)
+                   for level in set(candidate_forms)}
+
+        # Pattern mixing rule: at most one non-solid item in the whole outfit
+        return [item for item, color, form in zip(candidates, candidate_colors, candidate_forms)
+                if color_ok[color] and form_ok[form] and fixed_patterned_count + item['patterned'] <= 1]
+
+    def _encode(self, items):
+        """
+        Returns a struct-of-arrays view of items: parallel lists of color codes
+        (indices into self.color_clash) and formality levels.
+        """
+        color_codes = [self.color_codes[item['color_l']] for item in items]
+        formality_levels = [item['formality_lvl'] for item in items]
+        return color_codes, formality_levels
 
     def _do_colors_clash(self, color1, color2):
         """
         Checks if two colors clash based on predefined rules.
         Args:
-            color1 (str): First color.
-            color2 (str): Second color.
+            color1 (str): First color, lowercased (e.g., item['color_l']).
+            color2 (str): Second color, lowercased.
         Returns:
             bool: True if colors clash, False otherwise.
         """
-        if not color1 or not color2:
-            return False
-        color1 = color1.lower()
-        color2 = color2.lower()
-
-        if color1 in self.neutral_colors or color2 in self.neutral_colors:
-            return False
-
-        if color1 in self.clashing_colors and color2 in self.clashing_colors[color1]:
-            return True
-        if color2 in self.clashing_colors and color1 in self.clashing_colors[color2]:
-            return True
-        return False
+        return _colors_clash(color1, color2)
 
     def _do_formalities_match(self, item1, item2, tolerance=1):
         """
@@ -293,11 +541,9 @@ class OutfitGenerator:
         Returns:
             bool: True if formalities match, False otherwise.
         """
-        if not item1 or not item2 or 'formality' not in item1 or 'formality' not in item2:
+        if not item1 or not item2 or 'formality_lvl' not in item1 or 'formality_lvl' not in item2:
             return True
-        formal1 = self.formality_levels.get(item1['formality'].lower(), 0)
-        formal2 = self.formality_levels.get(item2['formality'].lower(), 0)
-        return abs(formal1 - formal2) <= tolerance
+        return abs(item1['formality_lvl'] - item2['formality_lvl']) <= tolerance
 
     def _is_item_suitable_for_occasion(self, item, occasion_formality_level):
         """
@@ -305,27 +551,11 @@ class OutfitGenerator:
         """
         if occasion_formality_level == 0: # 'Any' occasion, no formality filtering
             return True
-        
-        item_formal = self.formality_levels.get(item['formality'].lower(), 0)
-        
+
         # Allow items that are at or slightly above/below the occasion's formality
         # For simplicity, let's say +/- 1 formality level is acceptable.
-        return abs(item_formal - occasion_formality_level) <= 1
-
+        return abs(item['formality_lvl'] - occasion_formality_level) <= 1
 
-    def _do_patterns_match(self, selected_items):
-        """
-        Checks pattern mixing rule: allows at most one non-solid patterned item.
-        Args:
-            selected_items (list): List of clothing items in the current outfit attempt.
-        Returns:
-            bool: True if pattern rules are met, False otherwise.
-        """
-        patterned_items_count = 0
-        for item in selected_items:
-            if item and 'pattern' in item and item['pattern'].lower() != 'solid':
-                patterned_items_count += 1
-        return patterned_items_count <= 1
 
     def generate_outfit(self, occasion_type='Any'):
         """
@@ -338,6 +568,32 @@ class OutfitGenerator:
         """
         occasion_formal_level = self.occasion_formality_map.get(occasion_type, 0) # Default to 'Any' (0)
 
+        # Filter categories by occasion formality once; the result is the same for every attempt
+        available = {category: [item for item in items if self._is_item_suitable_for_occasion(item, occasion_formal_level)]
+                     for category, items in self.categories.items()}
+        available_tops = available['Top']
+        available_bottoms = available['Bottom']
+        available_dresses = available['Dress']
+        available_outerwear = available['Outerwear']
+        available_shoes = available['Shoes']
+        available_accessories = available['Accessory']
+
+        # Parallel (color code, formality level) lists per category, indexed like the lists above
+        top_colors, top_forms = self._encode(available_tops)
+        bottom_colors, bottom_forms = self._encode(available_bottoms)
+        dress_colors, dress_forms = self._encode(available_dresses)
+        outerwear_colors, outerwear_forms = self._encode(available_outerwear)
+        shoe_colors, shoe_forms = self._encode(available_shoes)
+        accessory_colors, accessory_forms = self._encode(available_accessories)
+        clash = self.color_clash
+
+        # Enumerate the compatible (top, bottom) pairs once and sample from them,
+        # instead of drawing random pairs and rejecting the ones that clash
+        top_bottom_pairs = [(t, b) for t in range(len(available_tops)) for b in range(len(available_bottoms))
+                            if abs(top_forms[t] - bottom_forms[b]) <= 1 and not clash[top_colors[t]][bottom_colors[b]]]
+        if not available_dresses and not top_bottom_pairs:
+            return None
+
         attempts = 0
         max_attempts = 1000 # Increased attempts for better chance of finding a combo
 
@@ -351,81 +607,58 @@ class OutfitGenerator:
                 'accessories': [],
                 'shoes': None,
             }
-            selected_items_for_rules = []
-
-            # Filter categories by occasion formality initially
-            available_tops = [item for item in self.categories['Top'] if self._is_item_suitable_for_occasion(item, occasion_formal_level)]
-            available_bottoms = [item for item in self.categories['Bottom'] if self._is_item_suitable_for_occasion(item, occasion_formal_level)]
-            available_dresses = [item for item in self.categories['Dress'] if self._is_item_suitable_for_occasion(item, occasion_formal_level)]
-            available_outerwear = [item for item in self.categories['Outerwear'] if self._is_item_suitable_for_occasion(item, occasion_formal_level)]
-            available_shoes = [item for item in self.categories['Shoes'] if self._is_item_suitable_for_occasion(item, occasion_formal_level)]
-            available_accessories = [item for item in self.categories['Accessory'] if self._is_item_suitable_for_occasion(item, occasion_formal_level)]
-
+            # Pattern mixing rule (at most one non-solid item), counted as items are picked
+            # so a doomed attempt is abandoned before the remaining slots are filled
+            patterned_count = 0
 
             # 1. Select a Top or a Dress (mutually exclusive)
-            use_dress = False
-            if available_dresses and (not available_tops or random.random() < 0.3):
-                outfit['dress'] = self._get_random_element(available_dresses)
-                if outfit['dress']:
-                    selected_items_for_rules.append(outfit['dress'])
-                    use_dress = True
-            
-            if not use_dress:
-                outfit['top'] = self._get_random_element(available_tops)
-                outfit['bottom'] = self._get_random_element(available_bottoms)
-
-                if outfit['top'] and outfit['bottom']:
-                    if not self._do_formalities_match(outfit['top'], outfit['bottom']) or \
-                       self._do_colors_clash(outfit['top']['color'], outfit['bottom']['color']):
-                        continue
-                    selected_items_for_rules.extend([outfit['top'], outfit['bottom']])
-                else:
-                    if not outfit['dress']:
-                        continue
+            if available_dresses and (not top_bottom_pairs or random.random() < 0.3):
+                d = random.randrange(len(available_dresses))
+                outfit['dress'] = available_dresses[d]
+                patterned_count += outfit['dress']['patterned']
+                # The dress is the base for outerwear, shoes and accessories alike
+                base_color, base_form = dress_colors[d], dress_forms[d]
+                shoes_base_color, shoes_base_form = base_color, base_form
             else:
-                outfit['top'] = None
-                outfit['bottom'] = None
-
-            if not selected_items_for_rules:
-                return None
+                t, b = random.choice(top_bottom_pairs)
+                outfit['top'] = available_tops[t]
+                outfit['bottom'] = available_bottoms[b]
+                patterned_count += outfit['top']['patterned'] + outfit['bottom']['patterned']
+                if patterned_count > 1:
+                    continue
+                base_color, base_form = top_colors[t], top_forms[t]
+                shoes_base_color, shoes_base_form = bottom_colors[b], bottom_forms[b]
 
             # 2. Select Optional Outerwear
             if available_outerwear:
-                potential_outerwear = self._get_random_element(available_outerwear)
-                base_item = outfit['dress'] if outfit['dress'] else outfit['top']
-                if base_item and self._do_formalities_match(base_item, potential_outerwear) and \
-                   not self._do_colors_clash(base_item['color'], potential_outerwear['color']):
-                    outfit['outerwear'] = potential_outerwear
-                    selected_items_for_rules.append(outfit['outerwear'])
+                o = random.randrange(len(available_outerwear))
+                if abs(base_form - outerwear_forms[o]) <= 1 and not clash[base_color][outerwear_colors[o]]:
+                    outfit['outerwear'] = available_outerwear[o]
+                    patterned_count += outfit['outerwear']['patterned']
+                    if patterned_count > 1:
+                        continue
 
             # 3. Select Optional Shoes
             if available_shoes:
-                potential_shoes = self._get_random_element(available_shoes)
-                base_item_for_shoes = outfit['dress'] if outfit['dress'] else (outfit['bottom'] or outfit['top'])
-                
-                if base_item_for_shoes and self._do_formalities_match(base_item_for_shoes, potential_shoes) and \
-                   not self._do_colors_clash(base_item_for_shoes['color'], potential_shoes['color']):
-                    outfit['shoes'] = potential_shoes
-                    selected_items_for_rules.append(outfit['shoes'])
-
+                s = random.randrange(len(available_shoes))
+                if abs(shoes_base_form - shoe_forms[s]) <= 1 and not clash[shoes_base_color][shoe_colors[s]]:
+                    outfit['shoes'] = available_shoes[s]
+                    patterned_count += outfit['shoes']['patterned']
+                    if patterned_count > 1:
+                        continue
 
             # 4. Select Optional Accessories
             if available_accessories:
                 num_accessories = random.randint(0, min(len(available_accessories), 3))
-                selected_accessory_ids = set()
-                for _ in range(num_accessories):
-                    accessory = self._get_random_element(available_accessories)
-                    if accessory and accessory['id'] not in selected_accessory_ids:
-                        base_item_for_acc = outfit['dress'] if outfit['dress'] else outfit['top']
-                        if base_item_for_acc and self._do_formalities_match(base_item_for_acc, accessory) and \
-                           not self._do_colors_clash(base_item_for_acc['color'], accessory['color']):
-                            outfit['accessories'].append(accessory)
-                            selected_items_for_rules.append(accessory)
-                            selected_accessory_ids.add(accessory['id'])
-
-            # Final check for pattern mixing across all selected items
-            if self._do_patterns_match(selected_items_for_rules):
-                return outfit
+                # Draw distinct accessories in one pass, then keep the ones that suit the base item
+                candidates = random.sample(range(len(available_accessories)), num_accessories)
+                outfit['accessories'] = [available_accessories[a] for a in candidates
+                                         if abs(base_form - accessory_forms[a]) <= 1 and not clash[base_color][accessory_colors[a]]]
+                patterned_count += sum(accessory['patterned'] for accessory in outfit['accessories'])
+                if patterned_count > 1:
+                    continue
+
+            return outfit
 
         return None # No suitable outfit found after max attempts
 
@@ -443,6 +676,8 @@ class OutfitMakerApp:
 
         self.db = WardrobeDatabase()
         self.clothing_items = []
+        self._tree_iids = set() # Item IDs currently shown in the wardrobe tree
+        self._generators = {} # Occasion formality level -> OutfitGenerator, reset whenever the wardrobe changes
         self.load_items()
 
         self.generated_outfit = None # Store the currently generated outfit
@@ -484,7 +719,7 @@ class OutfitMakerApp:
         tk.Label(self.wardrobe_frame, text="Category:", style='TLabel').grid(row=3, column=0, sticky="w", pady=5)
         # Updated category list to include "Shoes"
         ttk.Combobox(self.wardrobe_frame, textvariable=self.category_var,
-                     values=["Top", "Bottom", "Dress", "Outerwear", "Accessory", "Shoes"], state="readonly", style='TCombobox').grid(row=3, column=1, sticky="ew", padx=5, pady=5)
+                     values=CLOTHING_CATEGORIES, state="readonly", style='TCombobox').grid(row=3, column=1, sticky="ew", padx=5, pady=5)
 
         self.color_var = tk.StringVar()
         tk.Label(self.wardrobe_frame, text="Main Color:", style='TLabel').grid(row=4, column=0, sticky="w", pady=5)
@@ -500,7 +735,8 @@ class OutfitMakerApp:
         ttk.Combobox(self.wardrobe_frame, textvariable=self.formality_var,
                      values=["Casual", "Smart Casual", "Semi-Formal", "Formal"], state="readonly", style='TCombobox').grid(row=6, column=1, sticky="ew", padx=5, pady=5)
 
-        tk.Button(self.wardrobe_frame, text="Add Item to Wardrobe", command=self.add_item, style='TButton').grid(row=7, column=0, columnspan=2, pady=10, sticky="ew")
+        tk.Button(self.wardrobe_frame, text="Add Item to Wardrobe", command=self.add_item, style='TButton').grid(row=7, column=0, pady=10, sticky="ew")
+        tk.Button(self.wardrobe_frame, text="Bulk Import...", command=self.bulk_import_items, style='TButton').grid(row=7, column=1, pady=10, sticky="ew", padx=(5,0))
 
         # Wardrobe List Display
         tk.Label(self.wardrobe_frame, text="Your Current Wardrobe", font=("Inter", 16, "bold"), fg="#6a1b9a", bg="#ffffff").grid(row=8, column=0, columnspan=2, pady=10, sticky="ew")
@@ -551,13 +787,9 @@ class OutfitMakerApp:
         tk.Button(self.outfit_frame, text="Clear Outfit", command=self.clear_outfit_display, style='TButton', background='#ff9800').grid(row=2, column=1, pady=10, sticky="ew", padx=(5,0)) 
         self.style.map('ClearOutfit.TButton', background=[('active', '#fb8c00')], style='ClearOutfit.TButton') 
 
-        # Button to save current outfit
-        tk.Button(self.outfit_frame, text="Save Current Outfit", command=self.save_current_outfit, style='TButton', background='#2196f3').grid(row=3, column=0, columnspan=2, pady=5, sticky="ew")
-        self.style.map('SaveOutfit.TButton', background=[('active', '#1976D2')], style='SaveOutfit.TButton') 
-
-        # Button to view saved outfits
-        tk.Button(self.outfit_frame, text="View Saved Outfits", command=self.open_saved_outfits_dialog, style='TButton', background='#9C27B0').grid(row=4, column=0, columnspan=2, pady=5, sticky="ew")
-        self.style.map('ViewSavedOutfits.TButton', background=[('active', '#7B1FA2')], style='ViewSavedOutfits.TButton') 
+        # Saved-outfit buttons (rows 3-4) are built once the window has had its first paint
+        self._outfit_controls_built = False
+        master.after_idle(self._build_outfit_controls_deferred)
 
 
         # Outfit Display Area
@@ -571,8 +803,15 @@ class OutfitMakerApp:
 
         # Image placeholders for outfit items
         self.outfit_photos = {} # Store PhotoImage references
+        self._slot_photos = {} # Slot key -> (PhotoImage, mode) owned by that slot, repainted in place with paste()
+        # Decoded thumbnails keyed by (path, width, height, mtime), so repeat displays skip decode + resize
+        self._thumb_cache = functools.lru_cache(maxsize=256)(self._load_thumb)
+        # PIL releases the GIL while decoding, so the slots of an outfit decode in parallel
+        self._decode_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+        # Placeholder images keyed by (color, size, text); the same few are shown over and over
+        self._placeholder_cache = functools.lru_cache(maxsize=64)(self._create_placeholder_photo)
         self.outfit_labels = {} # Store Tkinter Label widgets
-        self.accessory_image_labels = [] # To store accessory image labels for clearing
+        self._acc_widget_pool = [] # Reusable accessory slots; shown/hidden instead of recreated
         self.change_buttons = {} # Store change buttons
 
         # Define item display positions and labels for clarity
@@ -610,13 +849,69 @@ class OutfitMakerApp:
             else:
                 self.accessory_image_frame = ttk.Frame(container, style='TFrame')
                 self.accessory_image_frame.grid(row=2, column=0, sticky="nsew", padx=5, pady=5)
+                for _ in range(ACCESSORY_POOL_SIZE):
+                    self._acc_slot(len(self._acc_widget_pool))
                 change_btn = tk.Button(container, text="Change Accessories", command=lambda t=item_type: self.open_change_item_dialog(t),
                                        style='TButton', background='#42a5f5', foreground='white')
                 change_btn.grid(row=3, column=0, pady=5, sticky="ew")
                 self.change_buttons[item_type] = change_btn
 
+        # Placeholders are built once here; clearing the display only reassigns them
+        item_types_display_sizes = {
+            'top': (150, 150), 'bottom': (150, 150), 'dress': (200, 200),
+            'outerwear': (150, 150), 'shoes': (150, 150), 'accessory': (70, 70)
+        }
+        self.placeholder_photos = {
+            'top': self._placeholder_cache("#D1C4E9", item_types_display_sizes['top'], text="TOP"),
+            'bottom': self._placeholder_cache("#E1BEE7", item_types_display_sizes['bottom'], text="BOTTOM"),
+            'dress': self._placeholder_cache("#F8BBD0", item_types_display_sizes['dress'], text="DRESS"),
+            'outerwear': self._placeholder_cache("#BBDEFB", item_types_display_sizes['outerwear'], text="OUTERWEAR"),
+            'shoes': self._placeholder_cache("#C8E6C9", item_types_display_sizes['shoes'], text="SHOES"),
+            'accessory': self._placeholder_cache("#FFF9C4", item_types_display_sizes['accessory'], text="ACC")
+        }
+
         self.initial_outfit_display_state()
 
+    def _build_outfit_controls_deferred(self):
+        """Creates the saved-outfit buttons; scheduled with after_idle so they don't delay startup."""
+        if self._outfit_controls_built:
+            return
+        self._outfit_controls_built = True
+
+        # Button to save current outfit
+        tk.Button(self.outfit_frame, text="Save Current Outfit", command=self.save_current_outfit, style='TButton', background='#2196f3').grid(row=3, column=0, columnspan=2, pady=5, sticky="ew")
+        self.style.map('SaveOutfit.TButton', background=[('active', '#1976D2')], style='SaveOutfit.TButton') 
+
+        # Button to view saved outfits
+        tk.Button(self.outfit_frame, text="View Saved Outfits", command=self.open_saved_outfits_dialog, style='TButton', background='#9C27B0').grid(row=4, column=0, columnspan=2, pady=5, sticky="ew")
+        self.style.map('ViewSavedOutfits.TButton', background=[('active', '#7B1FA2')], style='ViewSavedOutfits.TButton') 
+
+    def _load_thumb(self, path, width, height, mtime):
+        """
+        Decodes an image file into a PIL image that fits within width x height.
+        Called through self._thumb_cache; mtime is only part of the cache key,
+        so a file that changed on disk is decoded again. Safe to run off the Tk thread.
+        """
+        img = Image.open(path)
+        # Let libjpeg decode at 1/2, 1/4 or 1/8 scale before resizing; no-op for other formats
+        img.draft('RGB', (width, height))
+        # After draft() the remaining downscale is small, so BICUBIC looks the same as LANCZOS and is cheaper;
+        # create_thumbnail keeps LANCZOS for the one-off stored thumbnail
+        img.thumbnail((width, height), Image.BICUBIC)
+        return img
+
+    def _decode_thumb(self, path, size):
+        """Returns the (cached) decoded thumbnail of an image file for a (width, height) display size."""
+        return self._thumb_cache(path, size[0], size[1], os.path.getmtime(path))
+
+    def _get_thumb(self, path, size):
+        """Returns a thumbnail PhotoImage of an image file; must be called on the Tk thread."""
+        return ImageTk.PhotoImage(self._decode_thumb(path, size))
+
+    def _display_path(self, item):
+        """Returns the image file to display for an item: its thumbnail, or the original if there is none."""
+        return item['thumb_path'] if os.path.exists(item['thumb_path']) else item['image_path']
+
     def _create_placeholder_photo(self, color, size, text=""):
         """
         Helper to create a solid colored placeholder image with optional text.
@@ -624,10 +919,7 @@ class OutfitMakerApp:
         img = Image.new('RGB', size, color=color)
         if text:
             d = ImageDraw.Draw(img)
-            try:
-                font = ImageFont.truetype("arial.ttf", size=size[0]//5) 
-            except IOError:
-                font = ImageFont.load_default()
+            font = _get_font(size[0]//5)
             
             text_bbox = d.textbbox((0,0), text, font=font)
             text_width = text_bbox[2] - text_bbox[0]
@@ -638,21 +930,7 @@ class OutfitMakerApp:
         return ImageTk.PhotoImage(img)
 
     def initial_outfit_display_state(self):
-        """Sets initial placeholder images/text for the outfit display area."""
-        item_types_display_sizes = {
-            'top': (150, 150), 'bottom': (150, 150), 'dress': (200, 200),
-            'outerwear': (150, 150), 'shoes': (150, 150), 'accessory': (70, 70)
-        }
-
-        self.placeholder_photos = {
-            'top': self._create_placeholder_photo("#D1C4E9", item_types_display_sizes['top'], text="TOP"),
-            'bottom': self._create_placeholder_photo("#E1BEE7", item_types_display_sizes['bottom'], text="BOTTOM"),
-            'dress': self._create_placeholder_photo("#F8BBD0", item_types_display_sizes['dress'], text="DRESS"),
-            'outerwear': self._create_placeholder_photo("#BBDEFB", item_types_display_sizes['outerwear'], text="OUTERWEAR"),
-            'shoes': self._create_placeholder_photo("#C8E6C9", item_types_display_sizes['shoes'], text="SHOES"),
-            'accessory': self._create_placeholder_photo("#FFF9C4", item_types_display_sizes['accessory'], text="ACC")
-        }
-
+        """Resets the outfit display to the placeholders built in __init__."""
         for item_type in ['top', 'bottom', 'outerwear', 'dress', 'shoes']:
             label_key = item_type
             info_label_key = item_type + "_info"
@@ -662,9 +940,7 @@ class OutfitMakerApp:
             self.outfit_photos[label_key] = self.placeholder_photos[item_type] 
 
         self.outfit_labels['accessories_info'].config(text="No accessories")
-        for widget in self.accessory_image_frame.winfo_children():
-            widget.destroy()
-        self.accessory_image_labels = []
+        self._hide_accessory_slots(0)
         
         for btn in self.change_buttons.values():
             btn.grid_forget()
@@ -682,9 +958,7 @@ class OutfitMakerApp:
         if file_path:
             self.image_path_var.set(file_path)
             try:
-                img = Image.open(file_path)
-                img.thumbnail((200, 200), Image.LANCZOS)
-                self.current_preview_photo = ImageTk.PhotoImage(img)
+                self.current_preview_photo = self._get_thumb(file_path, (200, 200))
                 self.image_preview_label.config(image=self.current_preview_photo, text="")
             except Exception as e:
                 messagebox.showerror("Error", f"Could not load image: {e}")
@@ -712,6 +986,34 @@ class OutfitMakerApp:
         else:
             messagebox.showerror("Error", "Failed to add item. It might already exist or there was a file error.")
 
+    def bulk_import_items(self):
+        """
+        Adds several photos at once, each tagged with the category, color, pattern and
+        formality currently entered in the form.
+        """
+        category = self.category_var.get()
+        color = self.color_var.get().strip()
+        pattern = self.pattern_var.get()
+        formality = self.formality_var.get()
+
+        if not all([category, color, pattern, formality]):
+            messagebox.showwarning("Missing Info", "Please fill in all fields; they are applied to every imported item.")
+            return
+
+        file_paths = filedialog.askopenfilenames(
+            filetypes=[("Image Files", "*.png;*.jpg;*.jpeg;*.gif;*.bmp")]
+        )
+        if not file_paths:
+            return
+
+        rows = [(category, color, pattern, formality, file_path) for file_path in file_paths]
+        if self.db.bulk_add_items(rows) is not None:
+            messagebox.showinfo("Success", f"{len(rows)} '{category}' items added.")
+            self.load_items()
+            self.clear_add_item_form()
+        else:
+            messagebox.showerror("Error", "Failed to import items. None were added; check that all files are readable images.")
+
 
     def clear_add_item_form(self):
         """Clears the add item form after submission."""
@@ -726,32 +1028,59 @@ class OutfitMakerApp:
     def load_items(self):
         """Loads all clothing items from the database into memory."""
         self.clothing_items = self.db.get_all_items()
+        self._generators = {}
         self.populate_wardrobe_tree()
 
+    def _get_generator(self, occasion):
+        """
+        Returns the OutfitGenerator for an occasion's formality window, building it on first use.
+        Generators are reused until load_items runs again, so their encoded tables are built once.
+        """
+        level = OutfitGenerator.occasion_formality_map.get(occasion, 0)
+        generator = self._generators.get(level)
+        if generator is None:
+            generator = OutfitGenerator(self.db.get_items_for_formality_range(
+                OutfitGenerator.formalities_for_occasion(level)))
+            self._generators[level] = generator
+        return generator
+
     def populate_wardrobe_tree(self):
-        """Populates the Treeview widget with current wardrobe items."""
-        for item in self.wardrobe_tree.get_children():
-            self.wardrobe_tree.delete(item)
+        """
+        Syncs the Treeview widget with current wardrobe items. Only rows that were
+        added or deleted since the last sync are touched; items are never edited in place,
+        so existing rows are left as they are.
+        """
+        new_ids = {item['id'] for item in self.clothing_items}
+        for iid in self._tree_iids - new_ids:
+            self.wardrobe_tree.delete(iid)
 
         if not self.clothing_items:
-            self.wardrobe_tree.insert("", "end", values=("No items yet", "", ""))
-            return
+            if not self.wardrobe_tree.exists("empty"):
+                self.wardrobe_tree.insert("", "end", iid="empty", values=("No items yet", "", ""))
+        elif self.wardrobe_tree.exists("empty"):
+            self.wardrobe_tree.delete("empty")
 
         for item in self.clothing_items:
-            self.wardrobe_tree.insert("", "end", iid=item['id'],
-                                       values=(item['category'], item['color'].title(), item['formality'].title()))
+            if item['id'] not in self._tree_iids:
+                self.wardrobe_tree.insert("", "end", iid=item['id'],
+                                           values=(item['category'], item['color_t'], item['formality_t']))
+        self._tree_iids = new_ids
 
     def delete_selected_item(self):
-        """Deletes the selected item from the database and updates the display."""
-        selected_item_id = self.wardrobe_tree.focus()
-        if not selected_item_id:
+        """Deletes the selected item(s) from the database and updates the display."""
+        selected_item_ids = self.wardrobe_tree.selection()
+        if not selected_item_ids:
             messagebox.showwarning("No Selection", "Please select an item to delete.")
             return
 
-        response = messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this item?")
+        if len(selected_item_ids) == 1:
+            prompt = "Are you sure you want to delete this item?"
+        else:
+            prompt = f"Are you sure you want to delete these {len(selected_item_ids)} items?"
+        response = messagebox.askyesno("Confirm Delete", prompt)
         if response:
-            if self.db.delete_item(selected_item_id):
-                messagebox.showinfo("Deleted", "Item deleted successfully.")
+            if self.db.delete_items(selected_item_ids):
+                messagebox.showinfo("Deleted", "Item(s) deleted successfully.")
                 self.load_items()
                 self.clear_outfit_display()
             else:
@@ -767,8 +1096,7 @@ class OutfitMakerApp:
             return
 
         selected_occasion = self.occasion_var.get()
-        generator = OutfitGenerator(self.clothing_items)
-        outfit = generator.generate_outfit(occasion_type=selected_occasion)
+        outfit = self._get_generator(selected_occasion).generate_outfit(occasion_type=selected_occasion)
 
         if outfit:
             self.generated_outfit = outfit
@@ -788,14 +1116,13 @@ class OutfitMakerApp:
 
         outfit_name = simpledialog.askstring("Save Outfit", "Enter a name for this outfit:", parent=self.master)
         if outfit_name:
-            # Prepare a simplified outfit dictionary for saving (only item IDs and category)
-            # This allows retrieving details from clothing_items table later
+            # Save only item IDs; details are looked up from the clothing_items table on load
             outfit_to_save = {}
             for k, v in self.generated_outfit.items():
                 if isinstance(v, dict) and 'id' in v: # Main items
-                    outfit_to_save[k] = {'id': v['id'], 'category': v['category']}
+                    outfit_to_save[k] = v['id']
                 elif isinstance(v, list): # Accessories
-                    outfit_to_save[k] = [{'id': acc['id'], 'category': acc['category']} for acc in v if 'id' in acc]
+                    outfit_to_save[k] = [acc['id'] for acc in v if 'id' in acc]
             
             if self.db.save_outfit(outfit_name, outfit_to_save):
                 messagebox.showinfo("Saved", f"Outfit '{outfit_name}' saved successfully!")
@@ -826,14 +1153,18 @@ class OutfitMakerApp:
         tree_scrollbar_y.grid(row=1, column=2, sticky="ns")
         saved_outfits_tree.configure(yscrollcommand=tree_scrollbar_y.set)
 
+        # Saved outfits fetched by the last populate; Load picks from here and then fetches only that outfit's items
+        state = {'rows': [], 'by_id': {}}
+
         def populate_saved_outfits_tree():
             for item in saved_outfits_tree.get_children():
                 saved_outfits_tree.delete(item)
-            saved_outfits = self.db.get_saved_outfits()
-            if not saved_outfits:
+            state['rows'] = self.db.get_saved_outfits()
+            state['by_id'] = {str(o['id']): o for o in state['rows']} # Keyed like the tree iids
+            if not state['rows']:
                 saved_outfits_tree.insert("", "end", values=("No saved outfits yet.", ""))
                 return
-            for outfit in saved_outfits:
+            for outfit in state['rows']:
                 saved_outfits_tree.insert("", "end", iid=outfit['id'],
                                            values=(outfit['name'], outfit['timestamp']))
         
@@ -852,30 +1183,13 @@ class OutfitMakerApp:
                 messagebox.showwarning("No Selection", "Please select an outfit to load.")
                 return
             
-            saved_outfits = self.db.get_saved_outfits()
-            selected_outfit_data = next((o['outfit_data'] for o in saved_outfits if str(o['id']) == selected_id), None)
+            selected_outfit = state['by_id'].get(selected_id)
+            loaded_outfit = self.db.resolve_saved_outfit(selected_outfit['outfit_refs']) if selected_outfit else None
             
-            if selected_outfit_data:
-                # Reconstruct the full outfit dict using clothing_items in memory
-                loaded_outfit = {}
-                all_items_by_id = {item['id']: item for item in self.clothing_items} # Map item IDs to full item data
-
-                for k, v in selected_outfit_data.items():
-                    if k == 'accessories':
-                        loaded_outfit[k] = [all_items_by_id.get(acc_info['id']) for acc_info in v if all_items_by_id.get(acc_info['id'])]
-                    elif isinstance(v, dict) and 'id' in v:
-                        loaded_outfit[k] = all_items_by_id.get(v['id'])
-                
-                # Check if all items in the loaded outfit are still in the wardrobe
-                is_valid = True
-                for part in ['top', 'bottom', 'dress', 'outerwear', 'shoes']:
-                    if loaded_outfit.get(part) is not None and loaded_outfit[part]['id'] not in all_items_by_id:
-                        is_valid = False
-                        break
-                for acc in loaded_outfit.get('accessories', []):
-                    if acc['id'] not in all_items_by_id:
-                        is_valid = False
-                        break
+            if loaded_outfit:
+                # Only this outfit's items are fetched, by ID; deleted ones are left out,
+                # so an outfit with nothing left to show is no longer usable
+                is_valid = any(loaded_outfit[part] for part in ['top', 'bottom', 'dress', 'outerwear', 'shoes', 'accessories'])
 
                 if is_valid:
                     self.generated_outfit = loaded_outfit
@@ -909,11 +1223,13 @@ class OutfitMakerApp:
         dialog.protocol("WM_DELETE_WINDOW", dialog.destroy)
         self.master.wait_window(dialog)
 
-    def display_outfit(self, outfit):
+    def display_outfit(self, outfit, changed=None):
         """
         Displays the generated outfit in the right panel.
         Args:
             outfit (dict): A dictionary containing the selected clothing items.
+            changed (set, optional): Outfit parts ('top', ..., 'accessories') to re-render;
+                                     other slots keep what they show. Renders everything when None.
         """
         if self.generated_outfit is None:
             self.clear_outfit_display()
@@ -924,26 +1240,35 @@ class OutfitMakerApp:
             'outerwear': (150, 150), 'shoes': (150, 150), 'accessory': (70, 70)
         }
 
-        for item_type in ['top', 'bottom', 'dress', 'outerwear', 'shoes']:
+        main_parts = [part for part in ['top', 'bottom', 'dress', 'outerwear', 'shoes'] if changed is None or part in changed]
+        show_accessories = changed is None or 'accessories' in changed
+
+        # Start decoding every slot at once in the pool; PhotoImages are then built here on the Tk thread
+        decoded = {item_type: self._decode_pool.submit(self._decode_thumb, self._display_path(outfit[item_type]),
+                                                       item_types_display_sizes[item_type])
+                   for item_type in main_parts if outfit.get(item_type)}
+        decoded_accessories = [self._decode_pool.submit(self._decode_thumb, self._display_path(acc),
+                                                        item_types_display_sizes['accessory'])
+                               for acc in outfit['accessories']] if show_accessories else []
+
+        for item_type in main_parts:
             item = outfit.get(item_type)
             label_key = item_type
             info_label_key = item_type + "_info"
             
             if item:
                 try:
-                    img = Image.open(item['image_path'])
-                    img.thumbnail(item_types_display_sizes[item_type], Image.LANCZOS)
-                    photo = ImageTk.PhotoImage(img)
+                    photo = self._slot_photo(label_key, decoded[item_type].result())
                     self.outfit_labels[label_key].config(image=photo)
                     self.outfit_photos[label_key] = photo
-                    self.outfit_labels[info_label_key].config(text=f"{item['color'].title()} {item['pattern']}\n({item['formality'].title()})")
+                    self.outfit_labels[info_label_key].config(text=f"{item['color_t']} {item['pattern']}\n({item['formality_t']})")
                 except FileNotFoundError:
-                    photo = self._create_placeholder_photo('lightgray', item_types_display_sizes[item_type], text="Image Missing")
+                    photo = self._placeholder_cache('lightgray', item_types_display_sizes[item_type], text="Image Missing")
                     self.outfit_labels[label_key].config(image=photo)
                     self.outfit_photos[label_key] = photo
                     self.outfit_labels[info_label_key].config(text=f"Image Missing for {item_type.title()}")
                 except Exception as e:
-                    photo = self._create_placeholder_photo('pink', item_types_display_sizes[item_type], text=f"Error: {e}")
+                    photo = self._placeholder_cache('pink', item_types_display_sizes[item_type], text=f"Error: {e}")
                     self.outfit_labels[label_key].config(image=photo)
                     self.outfit_photos[label_key] = photo
                     self.outfit_labels[info_label_key].config(text=f"Image Error for {item_type.title()}")
@@ -952,82 +1277,78 @@ class OutfitMakerApp:
                 self.outfit_photos[label_key] = self.placeholder_photos[item_type]
                 self.outfit_labels[info_label_key].config(text=f"No {item_type} selected")
 
-        accessories_text = []
-        for widget in self.accessory_image_frame.winfo_children():
-            widget.destroy()
-        self.accessory_image_labels = []
+        if not show_accessories:
+            return
 
+        accessories_text = []
         for i, acc in enumerate(outfit['accessories']):
+            slot = self._acc_slot(i)
             try:
-                img = Image.open(acc['image_path'])
-                img.thumbnail(item_types_display_sizes['accessory'], Image.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                self.outfit_photos[f'accessory_{i}'] = photo
-
-                acc_container = ttk.Frame(self.accessory_image_frame, style='TFrame', relief="solid", borderwidth=1, padding=2)
-                acc_container.grid(row=0, column=i, padx=3, pady=3, sticky="nsew")
-                acc_container.grid_rowconfigure(0, weight=1)
-                acc_container.grid_rowconfigure(1, weight=0)
-                acc_container.grid_columnconfigure(0, weight=1)
-
-                acc_label = tk.Label(acc_container, image=photo, bg="#ffffff")
-                acc_label.grid(row=0, column=0, sticky="nsew")
-                
-                acc_info_label = tk.Label(acc_container, text=f"{acc['color'].title()}\n({acc['formality'].title()})", bg="#ffffff", font=("Inter", 8), wraplength=70)
-                acc_info_label.grid(row=1, column=0, sticky="ew")
-
-                accessories_text.append(f"{acc['color'].title()} {acc['category']}")
-                self.accessory_image_labels.append(acc_label)
-
+                photo = self._slot_photo(f'accessory_{i}', decoded_accessories[i].result())
+                info_text = f"{acc['color_t']}\n({acc['formality_t']})"
+                accessories_text.append(f"{acc['color_t']} {acc['category']}")
             except FileNotFoundError:
-                photo = self._create_placeholder_photo('lightgray', item_types_display_sizes['accessory'], text="Missing")
-                self.outfit_photos[f'accessory_{i}'] = photo
-
-                acc_container = ttk.Frame(self.accessory_image_frame, style='TFrame', relief="solid", borderwidth=1, padding=2)
-                acc_container.grid(row=0, column=i, padx=3, pady=3, sticky="nsew")
-                acc_container.grid_rowconfigure(0, weight=1)
-                acc_container.grid_rowconfigure(1, weight=0)
-                acc_container.grid_columnconfigure(0, weight=1)
-                acc_label = tk.Label(acc_container, image=photo, bg="#ffffff")
-                acc_label.grid(row=0, column=0, sticky="nsew")
-                acc_info_label = tk.Label(acc_container, text="Image Missing", bg="#ffffff", font=("Inter", 8))
-                acc_info_label.grid(row=1, column=0, sticky="ew")
+                photo = self._placeholder_cache('lightgray', item_types_display_sizes['accessory'], text="Missing")
+                info_text = "Image Missing"
                 accessories_text.append(f"Missing image for {acc['category']}")
-                self.accessory_image_labels.append(acc_label)
-
             except Exception as e:
-                photo = self._create_placeholder_photo('pink', item_types_display_sizes['accessory'], text=f"Error: {e}")
-                self.outfit_photos[f'accessory_{i}'] = photo
-
-                acc_container = ttk.Frame(self.accessory_image_frame, style='TFrame', relief="solid", borderwidth=1, padding=2)
-                acc_container.grid(row=0, column=i, padx=3, pady=3, sticky="nsew")
-                acc_container.grid_rowconfigure(0, weight=1)
-                acc_container.grid_rowconfigure(1, weight=0)
-                acc_container.grid_columnconfigure(0, weight=1)
-                acc_label = tk.Label(acc_container, image=photo, bg="#ffffff")
-                acc_label.grid(row=0, column=0, sticky="nsew")
-                acc_info_label = tk.Label(acc_container, text=f"Error: {e}", bg="#ffffff", font=("Inter", 8), wraplength=70)
-                acc_info_label.grid(row=1, column=0, sticky="ew")
+                photo = self._placeholder_cache('pink', item_types_display_sizes['accessory'], text=f"Error: {e}")
+                info_text = f"Error: {e}"
                 accessories_text.append(f"Error for {acc['category']}")
-                self.accessory_image_labels.append(acc_label)
 
+            self.outfit_photos[f'accessory_{i}'] = photo
+            slot['image'].config(image=photo)
+            slot['info'].config(text=info_text)
+            slot['container'].grid()
+        self._hide_accessory_slots(len(outfit['accessories']))
 
         if accessories_text:
             self.outfit_labels['accessories_info'].config(text="Accessories: " + ", ".join(accessories_text))
         else:
             self.outfit_labels['accessories_info'].config(text="No accessories")
         
-        for col_idx in range(self.accessory_image_frame.grid_size()[0]):
-            self.accessory_image_frame.grid_columnconfigure(col_idx, weight=0)
-        for col_idx in range(len(outfit['accessories'])):
-            self.accessory_image_frame.grid_columnconfigure(col_idx, weight=1)
+        for col_idx, slot in enumerate(self._acc_widget_pool):
+            self.accessory_image_frame.grid_columnconfigure(col_idx, weight=1 if col_idx < len(outfit['accessories']) else 0)
+
+    def _slot_photo(self, key, img):
+        """
+        Returns the display slot's own PhotoImage showing img. The existing image is
+        repainted with paste() when both size and mode match (paste converts to the
+        PhotoImage's mode, which would drop color or alpha); otherwise a new one is allocated.
+        """
+        photo, mode = self._slot_photos.get(key, (None, None))
+        if photo is not None and mode == img.mode and (photo.width(), photo.height()) == img.size:
+            photo.paste(img)
+        else:
+            photo = ImageTk.PhotoImage(img)
+            self._slot_photos[key] = (photo, img.mode)
+        return photo
+
+    def _acc_slot(self, index):
+        """Returns the pooled accessory widgets for column `index`, creating them on first use."""
+        while len(self._acc_widget_pool) <= index:
+            col = len(self._acc_widget_pool)
+            acc_container = ttk.Frame(self.accessory_image_frame, style='TFrame', relief="solid", borderwidth=1, padding=2)
+            acc_container.grid(row=0, column=col, padx=3, pady=3, sticky="nsew")
+            acc_container.grid_rowconfigure(0, weight=1)
+            acc_container.grid_rowconfigure(1, weight=0)
+            acc_container.grid_columnconfigure(0, weight=1)
+            acc_label = tk.Label(acc_container, bg="#ffffff")
+            acc_label.grid(row=0, column=0, sticky="nsew")
+            acc_info_label = tk.Label(acc_container, bg="#ffffff", font=("Inter", 8), wraplength=70)
+            acc_info_label.grid(row=1, column=0, sticky="ew")
+            acc_container.grid_remove()
+            self._acc_widget_pool.append({'container': acc_container, 'image': acc_label, 'info': acc_info_label})
+        return self._acc_widget_pool[index]
+
+    def _hide_accessory_slots(self, start):
+        """Hides pooled accessory slots from `start` onwards, keeping their widgets for reuse."""
+        for slot in self._acc_widget_pool[start:]:
+            slot['container'].grid_remove()
 
     def clear_outfit_display(self):
         """Clears the displayed outfit."""
         self.initial_outfit_display_state()
-        for widget in self.accessory_image_frame.winfo_children():
-            widget.destroy() 
-        self.accessory_image_labels = []
         
         for btn in self.change_buttons.values():
             btn.grid_forget()
@@ -1067,64 +1388,23 @@ class OutfitMakerApp:
         change_tree.configure(yscrollcommand=tree_scrollbar_y.set)
 
         compatible_items = []
-        outfit_generator_instance = OutfitGenerator(self.clothing_items)
+        compatible_by_id = {} # Keyed by str(id) to match the tree iids
 
-        # Get the formality level of the current occasion selection
-        current_occasion_formal_level = outfit_generator_instance.occasion_formality_map.get(self.occasion_var.get(), 0)
+        # Candidates come pre-filtered by category and by the current occasion's formality
+        outfit_generator_instance = self._get_generator(self.occasion_var.get())
+        category_to_change = 'Accessory' if item_type_to_change == 'accessories' else item_type_to_change.title()
 
-        for item in self.clothing_items:
-            # Check if category matches the type to change
-            if item['category'].lower() != item_type_to_change.lower():
-                if item_type_to_change.lower() == 'accessories' and item['category'].lower() == 'accessory':
-                    pass
-                else:
-                    continue
+        # Everything in the outfit except the part being changed stays fixed
+        fixed_items = [self.generated_outfit[part] for part in ['top', 'bottom', 'dress', 'outerwear', 'shoes']
+                       if self.generated_outfit.get(part) and part != item_type_to_change]
+        if item_type_to_change != 'accessories':
+            fixed_items.extend(self.generated_outfit['accessories'])
 
-            # Also filter by occasion suitability
-            if not outfit_generator_instance._is_item_suitable_for_occasion(item, current_occasion_formal_level):
-                continue
-
-
-            is_compatible = True
-            current_outfit_copy = self.generated_outfit.copy()
-            
-            if item_type_to_change != 'accessories':
-                current_outfit_copy[item_type_to_change] = item
-            else:
-                current_outfit_copy['accessories'] = [item]
-
-            proposed_outfit_items = []
-            if current_outfit_copy['top']: proposed_outfit_items.append(current_outfit_copy['top'])
-            if current_outfit_copy['bottom']: proposed_outfit_items.append(current_outfit_copy['bottom'])
-            if current_outfit_copy['dress']: proposed_outfit_items.append(current_outfit_copy['dress'])
-            if current_outfit_copy['outerwear']: proposed_outfit_items.append(current_outfit_copy['outerwear'])
-            if current_outfit_copy['shoes']: proposed_outfit_items.append(current_outfit_copy['shoes'])
-            proposed_outfit_items.extend(current_outfit_copy['accessories'])
-
-            for i in range(len(proposed_outfit_items)):
-                for j in range(i + 1, len(proposed_outfit_items)):
-                    item1 = proposed_outfit_items[i]
-                    item2 = proposed_outfit_items[j]
-
-                    if outfit_generator_instance._do_colors_clash(item1['color'], item2['color']):
-                        is_compatible = False
-                        break
-                    if not outfit_generator_instance._do_formalities_match(item1, item2):
-                        is_compatible = False
-                        break
-                if not is_compatible:
-                    break
-
-            if not is_compatible:
-                continue
-
-            if not outfit_generator_instance._do_patterns_match(proposed_outfit_items):
-                is_compatible = False
-            
-            if is_compatible:
-                compatible_items.append(item)
-                change_tree.insert("", "end", iid=item['id'],
-                                   values=(item['color'].title(), item['pattern'], item['formality'].title()))
+        for item in outfit_generator_instance.compatible_candidates(category_to_change, fixed_items):
+            compatible_items.append(item)
+            compatible_by_id[str(item['id'])] = item
+            change_tree.insert("", "end", iid=item['id'],
+                               values=(item['color_t'], item['pattern'], item['formality_t']))
 
         if not compatible_items:
             tk.Label(dialog, text="No compatible items found in your wardrobe for this category.",
@@ -1136,21 +1416,24 @@ class OutfitMakerApp:
                 messagebox.showwarning("No Selection", "Please select an item.")
                 return
 
-            selected_item = next((item for item in compatible_items if str(item['id']) == selected_id), None)
+            selected_item = compatible_by_id.get(selected_id)
             
             if selected_item:
+                changed = {item_type_to_change} # Only these slots are re-rendered
                 if item_type_to_change != 'accessories':
                     if item_type_to_change == 'dress':
                         self.generated_outfit['top'] = None
                         self.generated_outfit['bottom'] = None
+                        changed.update(('top', 'bottom'))
                     elif self.generated_outfit['dress'] and (item_type_to_change == 'top' or item_type_to_change == 'bottom'):
                         self.generated_outfit['dress'] = None
+                        changed.add('dress')
                     
                     self.generated_outfit[item_type_to_change] = selected_item
                 else:
                     self.generated_outfit['accessories'] = [selected_item] # For simplicity, replace all
                 
-                self.display_outfit(self.generated_outfit) 
+                self.display_outfit(self.generated_outfit, changed=changed)
                 dialog.destroy()
             else:
                 messagebox.showwarning("Error", "Could not find selected item details.")
@@ -1165,11 +1448,14 @@ class OutfitMakerApp:
     def on_closing(self):
         """Handles graceful closing of the application."""
         if messagebox.askokcancel("Quit", "Do you want to quit?"):
+            self._decode_pool.shutdown(wait=False)
             self.db.close()
             self.master.destroy()
 
 # --- Main execution ---
 if __name__ == "__main__":
+    # Pillow-SIMD releases carry a ".postN" suffix; stock Pillow does not
+    print(f"Pillow {PIL_VERSION}" + (" (SIMD build)" if ".post" in PIL_VERSION else ""))
     root = tk.Tk()
     app = OutfitMakerApp(root)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)